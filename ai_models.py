@@ -6,14 +6,205 @@ including APY analysis, liquidity scoring, and risk assessment.
 """
 
 import logging
-from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
+import warnings
+from typing import Dict, List, Any, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE = True
+except ImportError:  # Optional: compiled scoring kernel when installed
+    _NUMBA_AVAILABLE = False
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Number of markets kept by predict_best_yield (best pick + 3 alternatives)
+_TOP_K = 4
+
+# Risk factors checked by analyze_market_risk_batch and their score weights
+_RISK_FACTORS = (
+    "Low liquidity (< $1M)",
+    "Moderate liquidity (< $5M)",
+    "Very high APY (> 20%) - verify sustainability",
+    "Low trading volume"
+)
+_RISK_WEIGHT_VALUES = (3, 1, 2, 1)
+_RISK_WEIGHTS = np.array(_RISK_WEIGHT_VALUES, dtype=np.int64)
+
+# Bound formatter for whole-dollar amounts (e.g. "$12,345")
+format_usd = "${:,.0f}".format
+
+# Forecast confidence by horizon: <= 3 days high, <= 7 days medium, else low
+_CONFIDENCE_BOUNDARIES = np.array([3, 7])
+_CONFIDENCE_LABELS = np.array(['high', 'medium', 'low'])
+
+
+def extract_market_arrays(markets: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    Extract scoring metrics from market data into parallel NumPy arrays.
+    
+    Args:
+        markets: List of market dictionaries from Pendle API
+        
+    Returns:
+        Dictionary of equally sized arrays: implied_apy, underlying_apy,
+        liquidity_usd, trading_volume_usd, days_to_expiry (numeric) and
+        symbol, protocol (object)
+    """
+    days_to_expiry = _days_to_expiry([m.get('expiry', '') for m in markets])
+    
+    return {
+        'symbol': np.array([m.get('proSymbol', 'Unknown') for m in markets], dtype=object),
+        'protocol': np.array([m.get('protocol', 'Unknown') for m in markets], dtype=object),
+        'implied_apy': np.array([m.get('impliedApy', 0) for m in markets], dtype=np.float64),
+        'underlying_apy': np.array([m.get('underlyingApy', 0) for m in markets], dtype=np.float64),
+        'liquidity_usd': np.array(
+            [(m.get('liquidity') or {}).get('usd', 0) for m in markets], dtype=np.float64
+        ),
+        'trading_volume_usd': np.array(
+            [(m.get('tradingVolume') or {}).get('usd', 0) for m in markets], dtype=np.float64
+        ),
+        'days_to_expiry': days_to_expiry
+    }
+
+
+def _parse_expiry(expiry: str) -> np.datetime64:
+    """Parse a single ISO-8601 expiry into a naive UTC datetime64 (NaT if invalid)."""
+    try:
+        expiry_date = datetime.fromisoformat(expiry)
+    except ValueError:
+        return np.datetime64('NaT', 's')
+    if expiry_date.tzinfo is not None:
+        expiry_date = expiry_date.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(expiry_date, 's')
+
+
+def _days_to_expiry(expiries: List[Any]) -> np.ndarray:
+    """
+    Compute whole days until expiry for a batch of ISO-8601 expiry strings.
+    
+    All expiries are parsed in a single datetime64 conversion; rows that
+    NumPy cannot parse directly (e.g. explicit UTC offsets) fall back to
+    datetime.fromisoformat. Missing or invalid expiries yield 0 days.
+    
+    Args:
+        expiries: Expiry values from the Pendle API (e.g. "2025-12-25T00:00:00.000Z")
+        
+    Returns:
+        int64 array of days to expiry
+    """
+    stripped = [
+        (e[:-1] if e.endswith('Z') else e) if isinstance(e, str) else ''
+        for e in expiries
+    ]
+    
+    try:
+        with warnings.catch_warnings():
+            # NumPy only warns on timezone offsets (UserWarning on 2.x,
+            # DeprecationWarning on 1.x); treat them as unparseable here
+            warnings.simplefilter('error')
+            expiry = np.array(stripped, dtype='datetime64[s]')
+    except (ValueError, Warning):
+        expiry = np.array([_parse_expiry(e) for e in stripped], dtype='datetime64[s]')
+    
+    missing = np.isnat(expiry)
+    with np.errstate(invalid='ignore'):
+        days = (expiry - np.datetime64('now', 's')) // np.timedelta64(1, 'D')
+    return np.where(missing, 0, days).astype(np.int64)
+
+
+def _score_and_topk_numpy(
+    implied: np.ndarray,
+    underlying: np.ndarray,
+    liquidity: np.ndarray,
+    days: np.ndarray,
+    k: int = _TOP_K
+) -> np.ndarray:
+    """
+    Score markets and select the k best, skipping markets expiring within 7 days.
+    
+    Args:
+        implied: Implied APYs as decimals
+        underlying: Underlying APYs as decimals
+        liquidity: Liquidity in USD
+        days: Days to expiry
+        k: Number of markets to select
+        
+    Returns:
+        int64 array of up to k market indices, best first
+    """
+    # APYs stay decimal; their 0.4/0.2 weights are pre-scaled by 100
+    score = (
+        implied * 40.0
+        + np.minimum(liquidity / 10_000_000, 10) * 0.3  # Normalize to 0-10 scale
+        + underlying * 20.0
+        + np.minimum(days / 365, 1) * 10 * 0.1  # Normalize to 0-10 scale
+    )
+    
+    # Skip expired, very short-term, or malformed markets
+    valid = np.flatnonzero((days >= 7) & np.isfinite(score))
+    if valid.size == 0:
+        return valid
+    
+    # Stable sort so tied markets keep input (liquidity) order, matching the
+    # numba kernel; argpartition would pick and order ties arbitrarily
+    return valid[np.argsort(-score[valid], kind='stable')[:k]]
+
+
+if _NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _score_and_topk_numba(implied, underlying, liquidity, days, k=_TOP_K):
+        """Compiled single-pass equivalent of _score_and_topk_numpy."""
+        top_idx = np.empty(k, dtype=np.int64)
+        top_score = np.empty(k, dtype=np.float64)
+        count = 0
+        
+        for i in range(implied.shape[0]):
+            if days[i] < 7:
+                continue
+            
+            score = (
+                implied[i] * 40.0
+                + min(liquidity[i] / 10_000_000, 10.0) * 0.3
+                + underlying[i] * 20.0
+                + min(days[i] / 365, 1.0) * 10 * 0.1
+            )
+            if not np.isfinite(score):
+                continue
+            
+            # Insert into the sorted top-k buffer (ties keep input order)
+            if count < k:
+                j = count
+                count += 1
+            elif score > top_score[k - 1]:
+                j = k - 1
+            else:
+                continue
+            while j > 0 and score > top_score[j - 1]:
+                top_score[j] = top_score[j - 1]
+                top_idx[j] = top_idx[j - 1]
+                j -= 1
+            top_score[j] = score
+            top_idx[j] = i
+        
+        return top_idx[:count]
+    
+    # Compile (or load from cache) at import so the first prediction is fast
+    _score_and_topk_numba(
+        np.zeros(1), np.zeros(1), np.zeros(1), np.zeros(1, dtype=np.int64), _TOP_K
+    )
+    _score_and_topk = _score_and_topk_numba
+else:
+    _score_and_topk = _score_and_topk_numpy
+
 
-def predict_best_yield(markets_data: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+def predict_best_yield(
+    markets_data: Optional[List[Dict[str, Any]]] = None,
+    arrays: Optional[Dict[str, np.ndarray]] = None
+) -> Dict[str, Any]:
     """
     Analyze market data and predict the best yield opportunity.
     
@@ -25,85 +216,61 @@ def predict_best_yield(markets_data: Optional[List[Dict[str, Any]]] = None) -> D
     
     Args:
         markets_data: List of market dictionaries from Pendle API
+        arrays: Output of extract_market_arrays for the same markets; when
+            given, markets_data is ignored and no per-market extraction runs
         
     Returns:
         Dictionary with predicted best token, expected yield, and reasoning
     """
-    if not markets_data or len(markets_data) == 0:
+    now_iso = datetime.utcnow().isoformat()
+    
+    if arrays is None and not markets_data:
         logger.warning("No market data provided for yield prediction")
         return {
             "predicted_best_token": "N/A",
             "expected_yield": "N/A",
             "reasoning": "No market data available",
             "confidence": "low",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": now_iso
         }
     
     try:
-        scored_markets = []
-        
-        for market in markets_data:
-            try:
-                # Extract key metrics
-                symbol = market.get('proSymbol', 'Unknown')
-                implied_apy = market.get('impliedApy', 0) * 100  # Convert to percentage
-                underlying_apy = market.get('underlyingApy', 0) * 100
-                liquidity_usd = market.get('liquidity', {}).get('usd', 0)
-                expiry = market.get('expiry', '')
-                protocol = market.get('protocol', 'Unknown')
-                
-                # Calculate days to expiry
-                days_to_expiry = 0
-                if expiry:
-                    try:
-                        expiry_date = datetime.fromisoformat(expiry.replace('Z', '+00:00'))
-                        days_to_expiry = (expiry_date - datetime.now(expiry_date.tzinfo)).days
-                    except:
-                        days_to_expiry = 0
-                
-                # Skip expired or very short-term markets
-                if days_to_expiry < 7:
-                    continue
-                
-                # Calculate weighted score
-                apy_score = implied_apy * 0.4
-                liquidity_score = min(liquidity_usd / 10_000_000, 10) * 0.3  # Normalize to 0-10 scale
-                underlying_score = underlying_apy * 0.2
-                expiry_score = min(days_to_expiry / 365, 1) * 10 * 0.1  # Normalize to 0-10 scale
-                
-                total_score = apy_score + liquidity_score + underlying_score + expiry_score
-                
-                scored_markets.append({
-                    'symbol': symbol,
-                    'protocol': protocol,
-                    'implied_apy': round(implied_apy, 2),
-                    'underlying_apy': round(underlying_apy, 2),
-                    'liquidity_usd': liquidity_usd,
-                    'days_to_expiry': days_to_expiry,
-                    'score': total_score
-                })
-                
-            except Exception as e:
-                logger.warning(f"Error scoring market: {e}")
-                continue
+        if arrays is None:
+            arrays = extract_market_arrays(markets_data)
+        liquidity_usd = arrays['liquidity_usd']
+        days_to_expiry = arrays['days_to_expiry']
+        
+        top = _score_and_topk(
+            arrays['implied_apy'], arrays['underlying_apy'], liquidity_usd, days_to_expiry, _TOP_K
+        )
         
-        if not scored_markets:
+        if top.size == 0:
             return {
                 "predicted_best_token": "N/A",
                 "expected_yield": "N/A",
                 "reasoning": "No valid markets found",
                 "confidence": "low",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": now_iso
             }
         
-        # Sort by score and get top recommendation
-        scored_markets.sort(key=lambda x: x['score'], reverse=True)
-        best = scored_markets[0]
+        # Convert to percentages only for the selected markets
+        implied_apy = arrays['implied_apy'][top] * 100
+        underlying_apy = arrays['underlying_apy'][top] * 100
+        
+        i = top[0]
+        best = {
+            'symbol': arrays['symbol'][i],
+            'protocol': arrays['protocol'][i],
+            'implied_apy': round(float(implied_apy[0]), 2),
+            'underlying_apy': round(float(underlying_apy[0]), 2),
+            'liquidity_usd': float(liquidity_usd[i]),
+            'days_to_expiry': int(days_to_expiry[i])
+        }
         
         # Build reasoning
         reasoning = (
             f"{best['symbol']} on {best['protocol']} offers {best['implied_apy']}% fixed APY "
-            f"with ${best['liquidity_usd']:,.0f} liquidity. "
+            f"with {format_usd(best['liquidity_usd'])} liquidity. "
             f"Expires in {best['days_to_expiry']} days. "
             f"Strong combination of yield and safety."
         )
@@ -122,13 +289,17 @@ def predict_best_yield(markets_data: Optional[List[Dict[str, Any]]] = None) -> D
             "confidence": confidence,
             "top_3_alternatives": [
                 {
-                    "symbol": m['symbol'],
-                    "apy": f"{m['implied_apy']}%",
-                    "protocol": m['protocol']
+                    "symbol": symbol,
+                    "apy": f"{round(float(apy), 2)}%",
+                    "protocol": protocol
                 }
-                for m in scored_markets[1:4]
+                for symbol, protocol, apy in zip(
+                    arrays['symbol'][top[1:]],
+                    arrays['protocol'][top[1:]],
+                    implied_apy[1:]
+                )
             ],
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": now_iso
         }
         
     except Exception as e:
@@ -138,7 +309,7 @@ def predict_best_yield(markets_data: Optional[List[Dict[str, Any]]] = None) -> D
             "expected_yield": "N/A",
             "reasoning": f"Analysis failed: {str(e)}",
             "confidence": "none",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": now_iso
         }
 
 
@@ -163,13 +334,13 @@ def predict_future_yield(
     Returns:
         List of predictions with dates, APY estimates, and confidence intervals
     """
+    now = datetime.utcnow()
+    
     if days < 1 or days > 365:
         logger.warning(f"Invalid prediction days: {days}. Using 7 days.")
         days = 7
     
     try:
-        predictions = []
-        
         # If we have current APY, use it as baseline
         if current_apy is not None:
             base_apy = current_apy * 100  # Convert to percentage
@@ -185,34 +356,41 @@ def predict_future_yield(
             trend = (historical_data[-1] - historical_data[0]) / len(historical_data)
             trend = max(min(trend, 0.5), -0.5)  # Cap trend at ±0.5% per day
         
+        day_idx = np.arange(1, days + 1)
+        
+        # Apply trend with diminishing effect (50% trend dampening)
+        # plus small random variation (±0.3%)
+        variations = np.random.uniform(-0.3, 0.3, days)
+        predicted = base_apy + trend * day_idx * 0.5 + variations
+        
+        # Ensure APY stays positive and reasonable
+        predicted = np.clip(predicted, 0.1, 50.0)
+        
+        # Calculate confidence interval (wider for further predictions)
+        conf_range = 0.5 + day_idx * 0.1  # Increases with time
+        
+        # Format all prediction dates in one pass
+        today = np.datetime64(now.date(), 'D')
+        dates = np.datetime_as_string(today + day_idx, unit='D').tolist()
+        
+        confidence = _CONFIDENCE_LABELS[np.searchsorted(_CONFIDENCE_BOUNDARIES, day_idx, side='left')]
+        
         # Generate predictions
-        for day in range(1, days + 1):
-            # Apply trend with diminishing effect
-            predicted_apy = base_apy + (trend * day * 0.5)  # 50% trend dampening
-            
-            # Add small random variation (±0.3%)
-            import random
-            variation = random.uniform(-0.3, 0.3)
-            predicted_apy += variation
-            
-            # Ensure APY stays positive and reasonable
-            predicted_apy = max(0.1, min(predicted_apy, 50.0))
-            
-            # Calculate confidence interval (wider for further predictions)
-            confidence_range = 0.5 + (day * 0.1)  # Increases with time
-            
-            prediction_date = datetime.utcnow() + timedelta(days=day)
-            
-            predictions.append({
+        predictions = [
+            {
                 "day": day,
-                "date": prediction_date.strftime("%Y-%m-%d"),
-                "predicted_apy": round(predicted_apy, 2),
+                "date": date,
+                "predicted_apy": round(apy, 2),
                 "confidence_interval": {
-                    "lower": round(predicted_apy - confidence_range, 2),
-                    "upper": round(predicted_apy + confidence_range, 2)
+                    "lower": round(apy - cr, 2),
+                    "upper": round(apy + cr, 2)
                 },
-                "confidence": "high" if day <= 3 else "medium" if day <= 7 else "low"
-            })
+                "confidence": conf
+            }
+            for day, apy, cr, date, conf in zip(
+                day_idx.tolist(), predicted.tolist(), conf_range.tolist(), dates, confidence.tolist()
+            )
+        ]
         
         logger.info(f"Generated {len(predictions)} yield predictions for {token}")
         return predictions
@@ -221,17 +399,100 @@ def predict_future_yield(
         logger.error(f"Error in predict_future_yield: {e}")
         return [{
             "day": 1,
-            "date": (datetime.utcnow() + timedelta(days=1)).strftime("%Y-%m-%d"),
+            "date": (now + timedelta(days=1)).strftime("%Y-%m-%d"),
             "predicted_apy": 0,
             "error": str(e),
             "confidence": "none"
         }]
 
 
+def _risk_inputs(market: Dict[str, Any]) -> Tuple[float, float, float]:
+    """Liquidity (USD), implied APY and trading volume (USD); missing or null values count as 0"""
+    liquidity = (market.get('liquidity') or {}).get('usd') or 0
+    implied_apy = market.get('impliedApy') or 0
+    volume = (market.get('tradingVolume') or {}).get('usd') or 0
+    return float(liquidity), float(implied_apy), float(volume)
+
+
+def _risk_flags(liquidity: Any, implied_apy: Any, volume: Any) -> Tuple[Any, ...]:
+    """
+    Risk factor flags in _RISK_FACTORS order.
+    
+    Uses only comparisons and &, so the same thresholds apply to scalars
+    and to NumPy arrays.
+    """
+    return (
+        liquidity < 1_000_000,
+        (liquidity >= 1_000_000) & (liquidity < 5_000_000),
+        implied_apy > 0.20,
+        volume < 100_000
+    )
+
+
+def _risk_entry(risk_score: int, flags: List[bool]) -> Dict[str, Any]:
+    """Build the risk analysis result for one market from its score and factor flags"""
+    return {
+        "risk_level": "Low" if risk_score <= 2 else "Medium" if risk_score <= 5 else "High",
+        "risk_score": risk_score,
+        "risk_factors": (
+            [label for label, hit in zip(_RISK_FACTORS, flags) if hit]
+            or ["No significant risks identified"]
+        ),
+        "recommendation": "Proceed with caution" if risk_score > 5 else "Suitable for most users"
+    }
+
+
+def _risk_error(error: Exception) -> Dict[str, Any]:
+    """Risk analysis result for a market that could not be assessed"""
+    return {
+        "risk_level": "Unknown",
+        "risk_score": 0,
+        "risk_factors": [f"Analysis error: {str(error)}"],
+        "recommendation": "Unable to assess risk"
+    }
+
+
+def analyze_market_risk_batch(markets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Analyze risk factors for many markets at once.
+    
+    Risk scores are computed for all markets with NumPy array operations
+    (0 = low risk, 10 = high risk):
+    - +3 for liquidity below $1M, +1 for liquidity below $5M
+    - +2 for implied APY above 20% (unusually high APY can indicate high risk)
+    - +1 for trading volume below $100k
+    
+    Args:
+        markets: List of market data dictionaries
+        
+    Returns:
+        List of risk analyses (one per market) with score and factors
+    """
+    try:
+        # Only the three risk inputs; no expiry parsing or symbol columns
+        inputs = np.array([_risk_inputs(m) for m in markets], dtype=np.float64).reshape(-1, 3)
+        
+        flags = np.column_stack(_risk_flags(*inputs.T))
+        risk_scores = flags @ _RISK_WEIGHTS
+        
+        return [
+            _risk_entry(risk_score, row)
+            for risk_score, row in zip(risk_scores.tolist(), flags.tolist())
+        ]
+        
+    except Exception as e:
+        logger.error(f"Error in analyze_market_risk_batch: {e}")
+        return [_risk_error(e) for _ in markets]
+
+
 def analyze_market_risk(market: Dict[str, Any]) -> Dict[str, Any]:
     """
     Analyze risk factors for a specific market.
     
+    Uses the same inputs and flags as analyze_market_risk_batch, evaluated
+    on scalars: for a single market NumPy's per-call overhead outweighs
+    vectorization.
+    
     Args:
         market: Market data dictionary
         
@@ -239,51 +500,11 @@ def analyze_market_risk(market: Dict[str, Any]) -> Dict[str, Any]:
         Risk analysis with score and factors
     """
     try:
-        liquidity = market.get('liquidity', {}).get('usd', 0)
-        implied_apy = market.get('impliedApy', 0) * 100
-        volume = market.get('tradingVolume', {}).get('usd', 0)
-        
-        risk_factors = []
-        risk_score = 0  # 0 = low risk, 10 = high risk
-        
-        # Liquidity risk
-        if liquidity < 1_000_000:
-            risk_factors.append("Low liquidity (< $1M)")
-            risk_score += 3
-        elif liquidity < 5_000_000:
-            risk_factors.append("Moderate liquidity (< $5M)")
-            risk_score += 1
-        
-        # APY risk (unusually high APY can indicate high risk)
-        if implied_apy > 20:
-            risk_factors.append("Very high APY (> 20%) - verify sustainability")
-            risk_score += 2
-        
-        # Volume risk
-        if volume < 100_000:
-            risk_factors.append("Low trading volume")
-            risk_score += 1
-        
-        # Determine overall risk level
-        if risk_score <= 2:
-            risk_level = "Low"
-        elif risk_score <= 5:
-            risk_level = "Medium"
-        else:
-            risk_level = "High"
+        flags = _risk_flags(*_risk_inputs(market))
+        risk_score = sum(weight for weight, hit in zip(_RISK_WEIGHT_VALUES, flags) if hit)
         
-        return {
-            "risk_level": risk_level,
-            "risk_score": risk_score,
-            "risk_factors": risk_factors if risk_factors else ["No significant risks identified"],
-            "recommendation": "Proceed with caution" if risk_score > 5 else "Suitable for most users"
-        }
+        return _risk_entry(risk_score, flags)
         
     except Exception as e:
         logger.error(f"Error in analyze_market_risk: {e}")
-        return {
-            "risk_level": "Unknown",
-            "risk_score": 0,
-            "risk_factors": [f"Analysis error: {str(e)}"],
-            "recommendation": "Unable to assess risk"
-        }
\ No newline at end of file
+        return _risk_error(e)
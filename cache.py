@@ -0,0 +1,60 @@
+"""
+In-Process TTL Cache
+
+Small time-based memoization for slow-changing Pendle API responses.
+Uses the same MARKETS_CACHE_TTL setting as the server; set it to 0 to
+disable caching (e.g. in CI). The setting is read when a cached function is
+called, so values loaded from .env after import are honoured.
+"""
+
+import os
+import time
+import functools
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+def markets_cache_ttl() -> float:
+    """Seconds a cached result stays valid (same variable and default as server.py)"""
+    return float(os.getenv("MARKETS_CACHE_TTL", "30"))
+
+
+def ttl_cache(maxsize: int = 32, ttl: Optional[float] = None) -> Callable:
+    """
+    Memoize a function's results for ttl seconds.
+    
+    Results are keyed by the call arguments; the least recently stored entry
+    is evicted once maxsize is reached. Exceptions are not cached.
+    
+    Args:
+        maxsize: Maximum number of cached results
+        ttl: Seconds a result is reused (0 disables caching); defaults to
+            MARKETS_CACHE_TTL at call time
+    
+    Returns:
+        Decorator adding the cache; the wrapped function gains cache_clear()
+    """
+    def decorator(func: Callable) -> Callable:
+        entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            max_age = markets_cache_ttl() if ttl is None else ttl
+            if max_age <= 0:
+                return func(*args, **kwargs)
+            
+            key = (args, tuple(sorted(kwargs.items())))
+            entry = entries.get(key)
+            if entry and time.monotonic() - entry[0] < max_age:
+                return entry[1]
+            
+            result = func(*args, **kwargs)
+            entries[key] = (time.monotonic(), result)
+            entries.move_to_end(key)
+            while len(entries) > maxsize:
+                entries.popitem(last=False)
+            return result
+        
+        wrapper.cache_clear = entries.clear
+        return wrapper
+    
+    return decorator
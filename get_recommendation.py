@@ -5,9 +5,162 @@ This script fetches real-time Pendle market data and uses AI to recommend
 the best yield opportunity.
 """
 
-from ai_models import predict_best_yield
+import hashlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from ai_models import format_usd, predict_best_yield
+from json_utils import json_loads
+from pendle_api import PENDLE_MARKETS_URL, SESSION
 import requests
 
+# Two small server-sorted queries instead of one large page: the most liquid
+# markets plus the highest fixed-yield outliers
+MARKETS_QUERIES = (
+    {"limit": 10, "order_by": "liquidity:desc"},
+    {"limit": 10, "order_by": "impliedApy:desc"},
+)
+
+# Market fields read by the AI models; everything else is dropped after parsing
+MARKET_FIELDS = (
+    "address", "proSymbol", "protocol", "impliedApy", "underlyingApy",
+    "liquidity", "expiry", "tradingVolume"
+)
+
+# On-disk cache of the last response per query (reused for CACHE_TTL seconds)
+CACHE_DIR = Path.home() / ".cache" / "pendle"
+CACHE_TTL = 60
+
+
+def _cache_path(key: str) -> Path:
+    """Return the cache file used for a request key"""
+    return CACHE_DIR / f"markets-{hashlib.sha1(key.encode()).hexdigest()[:16]}.json"
+
+
+def _load_cache(key: str) -> Optional[Dict[str, Any]]:
+    """Load the cached markets response, if any, for a request key"""
+    try:
+        entry = json.loads(_cache_path(key).read_text())
+    except (OSError, ValueError):
+        return None
+    return entry if entry.get("key") == key else None
+
+
+def _save_cache(key: str, data: Dict[str, Any], etag: Optional[str]) -> None:
+    """Persist a markets response to the on-disk cache"""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _cache_path(key).write_text(json.dumps({
+            "key": key,
+            "etag": etag,
+            "fetched_at": time.time(),
+            "data": data
+        }))
+    except OSError:
+        pass
+
+
+def _fetch_page(params: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], int]:
+    """
+    Fetch one page of Pendle markets, reusing the on-disk cache when possible.
+    
+    A cached response younger than CACHE_TTL is returned without touching
+    the network. Older entries are revalidated with If-None-Match, and are
+    used as a fallback when the API errors or is unreachable.
+    
+    Args:
+        params: Query parameters for the markets endpoint
+        
+    Returns:
+        Tuple of (response JSON or None, HTTP status code)
+    """
+    key = f"{PENDLE_MARKETS_URL}?{sorted(params.items())}"
+    cached = _load_cache(key)
+    if cached and time.time() - cached.get("fetched_at", 0) < CACHE_TTL:
+        return cached["data"], 200
+    
+    headers = {}
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    
+    try:
+        response = SESSION.get(
+            PENDLE_MARKETS_URL,
+            params=params,
+            headers=headers,
+            timeout=10
+        )
+    except requests.exceptions.RequestException:
+        if not cached:
+            raise
+        print("[!] Pendle API unreachable, using cached market data")
+        return cached["data"], 200
+    
+    if response.status_code == 200:
+        data = json_loads(response.content)
+        data["results"] = [
+            {field: market[field] for field in MARKET_FIELDS if field in market}
+            for market in data.get("results", [])
+        ]
+        _save_cache(key, data, response.headers.get("ETag"))
+        return data, 200
+    
+    if cached:
+        if response.status_code == 304:
+            _save_cache(key, cached["data"], cached.get("etag"))
+        else:
+            print(f"[!] API returned status code {response.status_code}, using cached market data")
+        return cached["data"], 200
+    
+    return None, response.status_code
+
+
+def fetch_candidate_markets() -> Tuple[Optional[Dict[str, Any]], int]:
+    """
+    Fetch the candidate markets for a recommendation.
+    
+    Runs every query in MARKETS_QUERIES in parallel and merges the results
+    of those that succeed, keeping each market (by address) once.
+    
+    Returns:
+        Tuple of (merged JSON with 'results' and 'total', or None if every
+        query failed, HTTP status code)
+    """
+    with ThreadPoolExecutor(max_workers=len(MARKETS_QUERIES)) as executor:
+        futures = [executor.submit(_fetch_page, params) for params in MARKETS_QUERIES]
+    
+    # One failed query (network or decoding) must not discard the others' results
+    pages = []
+    errors = []
+    for future in futures:
+        try:
+            pages.append(future.result())
+        except Exception as e:
+            errors.append(e)
+    
+    successful = [data for data, _ in pages if data is not None]
+    if not successful:
+        if not pages:
+            raise errors[0]
+        return None, pages[0][1]
+    
+    markets = []
+    seen = set()
+    for data in successful:
+        for market in data.get("results", []):
+            address = market.get("address")
+            if address:
+                if address in seen:
+                    continue
+                seen.add(address)
+            markets.append(market)
+    
+    total = max(data.get("total", 0) for data in successful)
+    return {"results": markets, "total": total}, 200
+
 
 def get_ai_recommendation():
     """Fetch markets and get AI recommendation"""
@@ -20,14 +173,9 @@ def get_ai_recommendation():
     # Fetch markets from Pendle API
     print("Fetching market data from Pendle Finance...")
     try:
-        response = requests.get(
-            "https://api-v2.pendle.finance/core/v1/1/markets",
-            params={"limit": 50, "order_by": "liquidity:desc"},
-            timeout=10
-        )
+        data, status_code = fetch_candidate_markets()
         
-        if response.status_code == 200:
-            data = response.json()
+        if data is not None:
             markets = data.get('results', [])
             total = data.get('total', 0)
             
@@ -47,7 +195,7 @@ def get_ai_recommendation():
             print(f"Protocol: {prediction.get('protocol')}")
             print(f"Expected Yield: {prediction.get('expected_yield')}")
             print(f"Underlying Yield: {prediction.get('underlying_yield')}")
-            print(f"Liquidity: ${prediction.get('liquidity_usd'):,.0f}")
+            print(f"Liquidity: {format_usd(prediction.get('liquidity_usd'))}")
             print(f"Days to Expiry: {prediction.get('days_to_expiry')}")
             print(f"Confidence: {prediction.get('confidence').upper()}")
             print()
@@ -69,7 +217,7 @@ def get_ai_recommendation():
             return prediction
             
         else:
-            print(f"[X] API Error: Status code {response.status_code}")
+            print(f"[X] API Error: Status code {status_code}")
             print("    This might be due to rate limiting. Try again in a moment.")
             return None
             
@@ -0,0 +1,16 @@
+"""
+JSON Decoding
+
+Dependency-free helper shared by the server and scripts: decodes with orjson
+when it is installed and falls back to the standard library otherwise.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON decoding when installed
+    orjson = None
+
+# Decode a JSON document from bytes or str
+json_loads = orjson.loads if orjson else json.loads
@@ -0,0 +1,118 @@
+"""
+Pendle API Helpers
+
+Market fetching and HTTP session shared by the test and recommendation scripts.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from cache import ttl_cache
+from json_utils import json_loads
+
+PENDLE_MARKETS_URL = "https://api-v2.pendle.finance/core/v1/1/markets"
+
+# Shared keep-alive session so repeated API calls reuse the TLS connection
+SESSION = requests.Session()
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=10,
+        max_retries=Retry(total=2, backoff_factor=0.3)
+    )
+)
+SESSION.headers.update({"Connection": "keep-alive", "Accept-Encoding": "gzip"})
+
+
+@ttl_cache(maxsize=32)
+def fetch_markets(
+    limit: int = 10,
+    order_by: str = "liquidity:desc"
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Fetch one page of Pendle markets.
+    
+    Results are reused for MARKETS_CACHE_TTL seconds per (limit, order_by).
+    
+    Args:
+        limit: Number of markets to fetch
+        order_by: Server-side sort, e.g. "liquidity:desc"
+    
+    Returns:
+        Tuple of (markets, total markets available)
+    
+    Raises:
+        requests.HTTPError: If the API returns a non-2xx status
+    """
+    response = SESSION.get(
+        PENDLE_MARKETS_URL,
+        params={"limit": limit, "order_by": order_by},
+        timeout=10
+    )
+    response.raise_for_status()
+    data = json_loads(response.content)
+    return data.get('results', []), data.get('total', 0)
+
+
+def index_markets(markets: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Index markets by proSymbol and by each dash-separated part of it.
+    
+    "PT-sUSDe-29MAY2025" is reachable as the full symbol as well as "PT",
+    "sUSDe" and "29MAY2025", so token lookups are a single dict probe.
+    
+    Args:
+        markets: Market dictionaries from Pendle API, most relevant first
+    
+    Returns:
+        Dictionary mapping each key to the first market carrying it
+    """
+    index: Dict[str, Dict[str, Any]] = {}
+    for market in markets:
+        pro_symbol = (market.get('proSymbol') or '')
+        index.setdefault(pro_symbol, market)
+        for part in pro_symbol.split('-'):
+            index.setdefault(part, market)
+    return index
+
+
+def fetch_markets_bulk(
+    symbols: List[str],
+    markets: Optional[List[Dict[str, Any]]] = None,
+    limit: int = 100
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Resolve several token symbols to their markets with at most one request.
+    
+    The markets endpoint has no symbol filter, so instead of one request per
+    token a single page is fetched (or the caller's markets are reused) and
+    every symbol is resolved against one index of it.
+    
+    Args:
+        symbols: Token symbols to look up (e.g. ["sUSDe", "PENDLE"])
+        markets: Already fetched markets to search instead of fetching
+        limit: Number of markets to fetch when markets is not given
+    
+    Returns:
+        Dictionary mapping each found symbol to the first (most liquid)
+        market with it as a symbol part, else whose proSymbol contains it
+    """
+    if markets is None:
+        markets, _ = fetch_markets(limit=limit)
+    
+    index = index_markets(markets)
+    found = {symbol: index[symbol] for symbol in symbols if symbol in index}
+    
+    # Substring fallback for symbols that aren't a whole dash-separated part
+    for market in markets:
+        if len(found) == len(symbols):
+            break
+        pro_symbol = (market.get('proSymbol') or '')
+        for symbol in symbols:
+            if symbol not in found and symbol in pro_symbol:
+                found[symbol] = market
+    return found
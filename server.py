@@ -10,18 +10,28 @@ interacting with Pendle Finance DeFi protocol, including:
 """
 
 import os
+import re
 import sys
+import math
+import time
+import hashlib
+import functools
+import asyncio
 import logging
-import requests
-from typing import Dict, Any, List, Optional
-from pydantic import BaseModel, Field, field_validator
+from contextlib import asynccontextmanager, suppress
+from typing import Dict, Any, List, Optional, AsyncIterator, Tuple
+
+import httpx
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from dotenv import load_dotenv
 from web3 import Web3
 from eth_account import Account
 from fastmcp import FastMCP
 
 # Import AI prediction functions
-from ai_models import predict_best_yield, predict_future_yield, analyze_market_risk
+from ai_models import extract_market_arrays, predict_best_yield, predict_future_yield, analyze_market_risk
+from json_utils import json_loads
 
 # -------------------------------
 # 1. LOGGING CONFIGURATION
@@ -45,6 +55,17 @@ PENDLE_CHAIN_ID = os.getenv("PENDLE_CHAIN_ID", "1")  # 1 = Ethereum mainnet
 PENDLE_API_BASE = "https://api-v2.pendle.finance/core/v1"
 PENDLE_API_URL = f"{PENDLE_API_BASE}/{PENDLE_CHAIN_ID}/markets"
 API_TIMEOUT = int(os.getenv("API_TIMEOUT", "10"))
+MARKETS_CACHE_TTL = float(os.getenv("MARKETS_CACHE_TTL", "30"))  # seconds
+
+# Interval between background connectivity checks reported by server_status
+HEALTH_CHECK_INTERVAL = 30  # seconds
+
+# Markets below this liquidity (or without a positive implied APY) are not
+# considered for AI recommendations
+MIN_MARKET_LIQUIDITY_USD = 10_000
+
+# How long a predict_best_token recommendation is served without rescoring
+PREDICTION_CACHE_TTL = 10  # seconds
 
 # Blockchain configuration (optional)
 RPC_URL = os.getenv("RPC_URL")
@@ -53,13 +74,35 @@ PRIVATE_KEY = os.getenv("PRIVATE_KEY")
 logger.info(f"Pendle API URL: {PENDLE_API_URL}")
 logger.info(f"API Timeout: {API_TIMEOUT}s")
 
+# Shared async HTTP/2 client: tool handlers await Pendle API calls without
+# blocking the event loop, and concurrent calls share pooled connections.
+# Connection failures are retried by the transport; 429/5xx responses are
+# retried in fetch_pendle_markets.
+API_RETRIES = 3
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def _new_async_client() -> httpx.AsyncClient:
+    """Build the pooled HTTP/2 client used for Pendle API calls"""
+    return httpx.AsyncClient(
+        transport=httpx.AsyncHTTPTransport(
+            http2=True,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+            retries=API_RETRIES
+        ),
+        timeout=API_TIMEOUT,
+        headers={"Accept": "application/json"}
+    )
+
+
+# Replaced by lifespan if a previous server session closed it
+ASYNC_CLIENT = _new_async_client()
+
 # -------------------------------
 # 3. WALLET / KEY VALIDATION
 # -------------------------------
-wallet_valid = False
-user_address = "0x0000000000000000000000000000000000000000"
+NULL_ADDRESS = "0x0000000000000000000000000000000000000000"
 w3 = None
-account = None
 
 if RPC_URL:
     try:
@@ -71,23 +114,54 @@ if RPC_URL:
     except Exception as e:
         logger.warning(f"✗ RPC connection error: {e}")
 
-if PRIVATE_KEY and PRIVATE_KEY.strip():
+
+@functools.cache
+def _get_account() -> Tuple[Optional[Any], str, bool]:
+    """
+    Derive the wallet account from PRIVATE_KEY on first use.
+    
+    Key derivation is deferred until a caller actually needs the account,
+    so server startup does not pay for it and a bad key cannot break import.
+    
+    Returns:
+        Tuple of (account, address, valid)
+    """
+    if not (PRIVATE_KEY and PRIVATE_KEY.strip()):
+        logger.info("No private key configured - using mock mode for transactions")
+        return None, NULL_ADDRESS, False
+    
     try:
         key_bytes = PRIVATE_KEY.lower().replace("0x", "")
         account = Account.from_key(key_bytes)
-        user_address = account.address
-        wallet_valid = True
-        logger.info(f"✓ Wallet loaded: {user_address}")
+        logger.info("✓ Wallet loaded: %s", account.address)
+        return account, account.address, True
     except Exception as e:
-        logger.warning(f"✗ Invalid private key: {e}")
+        logger.warning("✗ Invalid private key: %s", e)
         logger.warning("Blockchain features will be disabled")
-else:
-    logger.info("No private key configured - using mock mode for transactions")
+        return None, NULL_ADDRESS, False
 
 # -------------------------------
 # 4. INITIALIZE FASTMCP SERVER
 # -------------------------------
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Run the background health checker and close the HTTP client on shutdown"""
+    global ASYNC_CLIENT
+    if ASYNC_CLIENT.is_closed:
+        ASYNC_CLIENT = _new_async_client()
+    
+    health_task = asyncio.create_task(health_check_loop())
+    try:
+        yield
+    finally:
+        health_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await health_task
+        await ASYNC_CLIENT.aclose()
+
+
 mcp = FastMCP(
+    lifespan=lifespan,
     name="Pendle Finance MCP",
     instructions=(
         "Provides comprehensive Pendle Finance market data, AI-powered yield predictions, "
@@ -100,8 +174,14 @@ mcp = FastMCP(
 # -------------------------------
 # 5. PYDANTIC MODELS
 # -------------------------------
+# Precompiled check for a 0x-prefixed, 40-hex-digit Ethereum address
+is_valid_address = re.compile(r"0x[0-9a-fA-F]{40}").fullmatch
+
+
 class Transaction(BaseModel):
     """Model for staking and swap transactions"""
+    model_config = ConfigDict(frozen=True, str_strip_whitespace=True)
+    
     user_address: str = Field(
         ...,
         description="Ethereum wallet address (0x...)",
@@ -124,28 +204,21 @@ class Transaction(BaseModel):
     @classmethod
     def validate_address(cls, v: str) -> str:
         """Validate Ethereum address format"""
-        if not v.startswith('0x'):
-            raise ValueError("Address must start with '0x'")
-        if len(v) != 42:
-            raise ValueError("Address must be 42 characters (0x + 40 hex chars)")
-        try:
-            # Validate hex format
-            int(v, 16)
-        except ValueError:
-            raise ValueError("Address must contain only hexadecimal characters")
+        if not is_valid_address(v):
+            raise ValueError("Invalid Ethereum address: expected 0x followed by 40 hex characters")
         return v.lower()
     
     @field_validator('token')
     @classmethod
     def validate_token(cls, v: str) -> str:
-        """Validate and normalize token symbol"""
-        return v.strip().upper()
+        """Normalize token symbol (whitespace is stripped by model_config)"""
+        return v.upper()
 
 
 # -------------------------------
 # 6. HELPER FUNCTIONS
 # -------------------------------
-def fetch_pendle_markets(limit: int = 10, skip: int = 0) -> Dict[str, Any]:
+async def _request_pendle_markets(limit: int, skip: int) -> Dict[str, Any]:
     """
     Fetch market data from Pendle API v2 with error handling and retries.
     
@@ -154,7 +227,8 @@ def fetch_pendle_markets(limit: int = 10, skip: int = 0) -> Dict[str, Any]:
         skip: Number of markets to skip for pagination
         
     Returns:
-        Dictionary with 'success', 'data', and optional 'error' keys
+        Dictionary with 'success', 'data', 'fetched_at' (on success), and
+        optional 'error' keys
     """
     try:
         params = {
@@ -163,47 +237,50 @@ def fetch_pendle_markets(limit: int = 10, skip: int = 0) -> Dict[str, Any]:
             "order_by": "liquidity:desc"  # Sort by liquidity
         }
         
-        logger.info(f"Fetching Pendle markets: limit={limit}, skip={skip}")
+        logger.info("Fetching Pendle markets: limit=%d, skip=%d", limit, skip)
         
-        response = requests.get(
-            PENDLE_API_URL,
-            params=params,
-            timeout=API_TIMEOUT,
-            headers={"Accept": "application/json"}
-        )
+        for attempt in range(API_RETRIES + 1):
+            response = await ASYNC_CLIENT.get(PENDLE_API_URL, params=params)
+            if response.status_code not in RETRY_STATUSES or attempt == API_RETRIES:
+                break
+            await asyncio.sleep(0.2 * 2 ** attempt)
         
         response.raise_for_status()
-        data = response.json()
+        data = json_loads(response.content)
         
-        results = data.get('results', [])
+        results = data.get('results') or []
+        if not isinstance(results, list):
+            raise ValueError("unexpected 'results' payload from Pendle API")
+        results = [m for m in results if isinstance(m, dict)]
         total = data.get('total', 0)
         
-        logger.info(f"✓ Fetched {len(results)} markets (total available: {total})")
+        logger.info("✓ Fetched %d markets (total available: %s)", len(results), total)
         
         return {
             "success": True,
             "data": results,
             "total": total,
             "limit": limit,
-            "skip": skip
+            "skip": skip,
+            "fetched_at": iso_now()
         }
         
-    except requests.exceptions.Timeout:
-        logger.error(f"✗ API request timeout after {API_TIMEOUT}s")
+    except httpx.TimeoutException:
+        logger.error("✗ API request timeout after %ss", API_TIMEOUT)
         return {
             "success": False,
             "error": "API request timeout",
             "data": []
         }
-    except requests.exceptions.RequestException as e:
-        logger.error(f"✗ API request failed: {e}")
+    except httpx.HTTPError as e:
+        logger.error("✗ API request failed: %s", e)
         return {
             "success": False,
             "error": f"API request failed: {str(e)}",
             "data": []
         }
     except Exception as e:
-        logger.error(f"✗ Unexpected error fetching markets: {e}")
+        logger.error("✗ Unexpected error fetching markets: %s", e)
         return {
             "success": False,
             "error": f"Unexpected error: {str(e)}",
@@ -211,30 +288,193 @@ def fetch_pendle_markets(limit: int = 10, skip: int = 0) -> Dict[str, Any]:
         }
 
 
+# Upstream requests currently in flight, keyed by (limit, skip)
+_INFLIGHT: Dict[Tuple[int, int], asyncio.Task] = {}
+
+
+async def fetch_pendle_markets(limit: int = 10, skip: int = 0) -> Dict[str, Any]:
+    """
+    Fetch market data from Pendle API v2, sharing in-flight requests.
+    
+    Concurrent calls for the same page await a single upstream request
+    instead of each issuing their own. The request is shielded, so a
+    cancelled caller does not cancel it for the others.
+    
+    Args:
+        limit: Number of markets to fetch (default 10)
+        skip: Number of markets to skip for pagination
+        
+    Returns:
+        Dictionary with 'success', 'data', and optional 'error' keys
+    """
+    key = (limit, skip)
+    task = _INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_request_pendle_markets(limit, skip))
+        _INFLIGHT[key] = task
+        task.add_done_callback(lambda _: _INFLIGHT.pop(key, None))
+    return await asyncio.shield(task)
+
+
+# Successful market fetches keyed by (limit, skip): (monotonic time, result)
+_MARKETS_CACHE: Dict[Tuple[int, int], Tuple[float, Dict[str, Any]]] = {}
+
+
+async def cached_fetch_pendle_markets(
+    limit: int = 10,
+    skip: int = 0,
+    ttl: float = MARKETS_CACHE_TTL
+) -> Dict[str, Any]:
+    """
+    Fetch market data, reusing a recent successful result for the same page.
+    
+    Pendle APYs move on the order of minutes, so back-to-back tool calls
+    share one upstream request. Concurrent refills of an expired entry are
+    coalesced by fetch_pendle_markets.
+    
+    Args:
+        limit: Number of markets to fetch
+        skip: Number of markets to skip for pagination
+        ttl: Maximum age in seconds of a reusable cached result
+        
+    Returns:
+        Same dictionary as fetch_pendle_markets
+    """
+    key = (limit, skip)
+    cached = _MARKETS_CACHE.get(key)
+    if cached and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+    
+    result = await fetch_pendle_markets(limit=limit, skip=skip)
+    if result['success']:
+        # Lowercased symbol -> implied APY, in API (liquidity) order, so
+        # token lookups don't rescan the markets on every call
+        symbol_index: Dict[str, Any] = {}
+        for market in result['data']:
+            symbol_index.setdefault(
+                (market.get('proSymbol') or '').lower(), market.get('impliedApy', 0)
+            )
+        result['_symbol_index'] = symbol_index
+        _MARKETS_CACHE[key] = (time.monotonic(), result)
+    return result
+
+
+# Connectivity status, refreshed in the background by health_check_loop
+_API_STATUS = "unknown"
+_RPC_STATUS = "not configured"
+_LAST_CHECK: Optional[float] = None
+
+
+async def check_health() -> None:
+    """Probe the Pendle API and Ethereum RPC and record their status."""
+    global _API_STATUS, _RPC_STATUS, _LAST_CHECK
+    
+    # Test API connectivity
+    api_status = "connected"
+    try:
+        response = await ASYNC_CLIENT.get(PENDLE_API_URL, timeout=5, params={"limit": 1})
+        if response.status_code != 200:
+            api_status = f"error (HTTP {response.status_code})"
+    except Exception:
+        api_status = "disconnected"
+    
+    # Test RPC connectivity (web3 is blocking, so keep it off the event loop)
+    rpc_status = "not configured"
+    if w3:
+        try:
+            connected = await asyncio.to_thread(w3.is_connected)
+        except Exception:
+            connected = False
+        rpc_status = "connected" if connected else "disconnected"
+    
+    _API_STATUS, _RPC_STATUS, _LAST_CHECK = api_status, rpc_status, time.monotonic()
+
+
+async def health_check_loop() -> None:
+    """Refresh connectivity status every HEALTH_CHECK_INTERVAL seconds."""
+    while True:
+        await check_health()
+        await asyncio.sleep(HEALTH_CHECK_INTERVAL)
+
+
+# Last successful predict_best_token result: (monotonic time, prediction)
+_PREDICTION_CACHE: Optional[Tuple[float, Dict[str, Any]]] = None
+
+
+def prefilter_markets(
+    markets: List[Dict[str, Any]],
+    min_liquidity: float = MIN_MARKET_LIQUIDITY_USD
+) -> List[Dict[str, Any]]:
+    """
+    Drop dust markets before AI scoring.
+    
+    Args:
+        markets: Raw market data from Pendle API
+        min_liquidity: Minimum liquidity in USD to keep a market
+        
+    Returns:
+        Markets with a positive implied APY and at least min_liquidity
+    """
+    apy = np.fromiter(
+        (m.get('impliedApy') or 0 for m in markets), dtype=np.float64, count=len(markets)
+    )
+    liquidity = np.fromiter(
+        ((m.get('liquidity') or {}).get('usd') or 0 for m in markets),
+        dtype=np.float64,
+        count=len(markets)
+    )
+    keep = (apy > 0) & (liquidity >= min_liquidity)
+    return [m for m, k in zip(markets, keep.tolist()) if k]
+
+
 def format_market_summary(market: Dict[str, Any]) -> Dict[str, Any]:
     """
     Format market data into a clean summary.
     
+    Missing or null fields fall back to defaults; markets are guaranteed
+    to be dicts by fetch_pendle_markets.
+    
     Args:
         market: Raw market data from Pendle API
         
     Returns:
         Formatted market summary
     """
-    try:
-        return {
-            "symbol": market.get('proSymbol', 'Unknown'),
-            "protocol": market.get('protocol', 'Unknown'),
-            "implied_apy": round(market.get('impliedApy', 0) * 100, 2),
-            "underlying_apy": round(market.get('underlyingApy', 0) * 100, 2),
-            "aggregated_apy": round(market.get('aggregatedApy', 0) * 100, 2),
-            "liquidity_usd": round(market.get('liquidity', {}).get('usd', 0), 2),
-            "expiry": market.get('expiry', 'N/A'),
-            "address": market.get('address', 'N/A')
-        }
-    except Exception as e:
-        logger.warning(f"Error formatting market: {e}")
-        return {"error": "Failed to format market data"}
+    get = market.get
+    liquidity = get('liquidity') or {}
+    return {
+        "symbol": get('proSymbol', 'Unknown'),
+        "protocol": get('protocol', 'Unknown'),
+        "implied_apy": round((get('impliedApy') or 0) * 100, 2),
+        "underlying_apy": round((get('underlyingApy') or 0) * 100, 2),
+        "aggregated_apy": round((get('aggregatedApy') or 0) * 100, 2),
+        "liquidity_usd": round(liquidity.get('usd') or 0, 2),
+        "expiry": get('expiry', 'N/A'),
+        "address": get('address', 'N/A')
+    }
+
+
+def iso_now() -> str:
+    """Return the current UTC time as an ISO-8601 string (second precision)."""
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+def mock_tx_hash(tx_type: str, data: Transaction) -> str:
+    """
+    Generate a deterministic mock transaction hash for a simulation.
+    
+    Unlike hash(), BLAKE2b is not salted per process, so the same
+    transaction always yields the same 32-byte hash.
+    
+    Args:
+        tx_type: Transaction type (e.g. "stake", "swap")
+        data: Transaction details
+        
+    Returns:
+        0x-prefixed 64-character hex hash
+    """
+    payload = f"{tx_type}|{data.user_address}|{data.token}|{data.amount}".encode()
+    return "0x" + hashlib.blake2b(payload, digest_size=32).hexdigest()
 
 
 # -------------------------------
@@ -262,9 +502,9 @@ async def get_yield(limit: int = 10) -> Dict[str, Any]:
         # Validate limit
         limit = max(1, min(limit, 50))
         
-        logger.info(f"[get_yield] Fetching top {limit} markets")
+        logger.info("[get_yield] Fetching top %d markets", limit)
         
-        result = fetch_pendle_markets(limit=limit)
+        result = await cached_fetch_pendle_markets(limit=limit)
         
         if not result['success']:
             return {
@@ -275,18 +515,18 @@ async def get_yield(limit: int = 10) -> Dict[str, Any]:
             }
         
         markets = result['data']
-        formatted_markets = [format_market_summary(m) for m in markets]
+        formatted_markets = list(map(format_market_summary, markets))
         
         return {
             "success": True,
             "markets": formatted_markets,
             "total_markets": result.get('total', 0),
             "returned": len(formatted_markets),
-            "timestamp": "2025-12-10T13:00:00Z"
+            "timestamp": result['fetched_at']
         }
         
     except Exception as e:
-        logger.error(f"[get_yield] Error: {e}")
+        logger.error("[get_yield] Error: %s", e)
         return {
             "success": False,
             "error": str(e),
@@ -314,12 +554,11 @@ async def stake(data: Transaction) -> Dict[str, Any]:
     """
     try:
         logger.info(
-            f"[stake] Simulating stake: {data.amount} {data.token} "
-            f"for {data.user_address}"
+            "[stake] Simulating stake: %s %s for %s",
+            data.amount, data.token, data.user_address
         )
         
-        # Generate deterministic mock transaction hash
-        tx_hash = f"0x{hash(f'{data.user_address}{data.token}{data.amount}') % (10**64):064x}"
+        tx_hash = mock_tx_hash("stake", data)
         
         return {
             "success": True,
@@ -336,7 +575,7 @@ async def stake(data: Transaction) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        logger.error(f"[stake] Error: {e}")
+        logger.error("[stake] Error: %s", e)
         return {
             "success": False,
             "error": str(e),
@@ -360,12 +599,11 @@ async def swap(data: Transaction) -> Dict[str, Any]:
     """
     try:
         logger.info(
-            f"[swap] Simulating swap: {data.amount} {data.token} "
-            f"for {data.user_address}"
+            "[swap] Simulating swap: %s %s for %s",
+            data.amount, data.token, data.user_address
         )
         
-        # Generate deterministic mock transaction hash
-        tx_hash = f"0x{hash(f'{data.token}{data.amount}{data.user_address}') % (10**64):064x}"
+        tx_hash = mock_tx_hash("swap", data)
         
         return {
             "success": True,
@@ -382,7 +620,7 @@ async def swap(data: Transaction) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        logger.error(f"[swap] Error: {e}")
+        logger.error("[swap] Error: %s", e)
         return {
             "success": False,
             "error": str(e),
@@ -409,14 +647,14 @@ async def portfolio(address: str) -> Dict[str, Any]:
     """
     try:
         # Validate address format
-        if not address.startswith('0x') or len(address) != 42:
+        if not is_valid_address(address):
             return {
                 "success": False,
                 "error": "Invalid address format",
-                "message": "Address must be 42 characters starting with 0x"
+                "message": "Invalid Ethereum address: expected 0x followed by 40 hex characters"
             }
         
-        logger.info(f"[portfolio] Fetching portfolio for {address}")
+        logger.info("[portfolio] Fetching portfolio for %s", address)
         
         # Mock portfolio data
         holdings = [
@@ -440,7 +678,7 @@ async def portfolio(address: str) -> Dict[str, Any]:
             }
         ]
         
-        total_value = sum(h['value_usd'] for h in holdings)
+        total_value = math.fsum(h['value_usd'] for h in holdings)
         
         return {
             "success": True,
@@ -449,11 +687,11 @@ async def portfolio(address: str) -> Dict[str, Any]:
             "total_value_usd": round(total_value, 2),
             "estimated_yearly_yield_usd": round(total_value * 0.054, 2),  # Mock 5.4% avg
             "note": "This is mock data. Real portfolio tracking coming soon.",
-            "timestamp": "2025-12-10T13:00:00Z"
+            "timestamp": iso_now()
         }
         
     except Exception as e:
-        logger.error(f"[portfolio] Error: {e}")
+        logger.error("[portfolio] Error: %s", e)
         return {
             "success": False,
             "error": str(e),
@@ -478,11 +716,17 @@ async def predict_best_token() -> Dict[str, Any]:
     Returns:
         Dictionary with AI recommendation, expected yield, reasoning, and alternatives
     """
+    global _PREDICTION_CACHE
+    
     try:
+        # The recommendation is stable over a few seconds; serve it as-is
+        if _PREDICTION_CACHE and time.monotonic() - _PREDICTION_CACHE[0] < PREDICTION_CACHE_TTL:
+            return _PREDICTION_CACHE[1]
+        
         logger.info("[predict_best_token] Running AI yield prediction")
         
         # Fetch market data
-        result = fetch_pendle_markets(limit=50)  # Analyze more markets for better prediction
+        result = await cached_fetch_pendle_markets(limit=50)  # Analyze more markets for better prediction
         
         if not result['success'] or not result['data']:
             return {
@@ -491,19 +735,28 @@ async def predict_best_token() -> Dict[str, Any]:
                 "message": "AI prediction requires current market data"
             }
         
-        # Run AI prediction
-        prediction = predict_best_yield(result['data'])
+        # Pack the markets worth considering into scoring arrays once per
+        # cached fetch; repeat calls within the TTL reuse them
+        arrays = result.get('_ranking_arrays')
+        if arrays is None:
+            arrays = extract_market_arrays(prefilter_markets(result['data']))
+            result['_ranking_arrays'] = arrays
+        
+        # Run AI prediction on the packed markets
+        prediction = predict_best_yield(arrays=arrays)
         prediction['success'] = True
+        if prediction.get('predicted_best_token') != "Error":
+            _PREDICTION_CACHE = (time.monotonic(), prediction)
         
         logger.info(
-            f"[predict_best_token] Recommendation: {prediction.get('predicted_best_token')} "
-            f"at {prediction.get('expected_yield')}"
+            "[predict_best_token] Recommendation: %s at %s",
+            prediction.get('predicted_best_token'), prediction.get('expected_yield')
         )
         
         return prediction
         
     except Exception as e:
-        logger.error(f"[predict_best_token] Error: {e}")
+        logger.error("[predict_best_token] Error: %s", e)
         return {
             "success": False,
             "error": str(e),
@@ -531,19 +784,24 @@ async def predict_future(token: str, days: int = 7) -> Dict[str, Any]:
         days = max(1, min(days, 30))
         token = token.strip()
         
-        logger.info(f"[predict_future] Predicting {days}-day yield for {token}")
+        logger.info("[predict_future] Predicting %d-day yield for %s", days, token)
         
         # Fetch current market data to get current APY
-        result = fetch_pendle_markets(limit=50)
+        result = await cached_fetch_pendle_markets(limit=50)
         current_apy = None
         
         if result['success']:
-            # Find the token in markets
-            for market in result['data']:
-                if token.lower() in market.get('proSymbol', '').lower():
-                    current_apy = market.get('impliedApy', 0)
-                    logger.info(f"Found {token} with current APY: {current_apy * 100:.2f}%")
-                    break
+            # Find the token in markets: exact symbol first, then substring
+            symbol_index = result['_symbol_index']
+            token_lower = token.lower()
+            current_apy = symbol_index.get(token_lower)
+            if current_apy is None:
+                current_apy = next(
+                    (apy for symbol, apy in symbol_index.items() if token_lower in symbol),
+                    None
+                )
+            if current_apy is not None:
+                logger.info("Found %s with current APY: %.2f%%", token, current_apy * 100)
         
         # Generate predictions
         predictions = predict_future_yield(
@@ -566,7 +824,7 @@ async def predict_future(token: str, days: int = 7) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        logger.error(f"[predict_future] Error: {e}")
+        logger.error("[predict_future] Error: %s", e)
         return {
             "success": False,
             "error": str(e),
@@ -582,23 +840,20 @@ async def server_status() -> Dict[str, Any]:
     """
     Get server status and configuration information.
     
+    Connectivity comes from the background health checker, so this call
+    does not hit the network (except once, if no check has run yet).
+    
     Returns:
         Dictionary with server health, configuration, and connectivity status
     """
     try:
-        # Test API connectivity
-        api_status = "connected"
-        try:
-            response = requests.get(PENDLE_API_URL, timeout=5, params={"limit": 1})
-            if response.status_code != 200:
-                api_status = f"error (HTTP {response.status_code})"
-        except:
-            api_status = "disconnected"
+        if _LAST_CHECK is None:
+            await check_health()
         
-        # Test RPC connectivity
-        rpc_status = "not configured"
-        if w3:
-            rpc_status = "connected" if w3.is_connected() else "disconnected"
+        if PRIVATE_KEY:
+            _, user_address, wallet_valid = _get_account()
+        else:
+            user_address, wallet_valid = NULL_ADDRESS, False
         
         return {
             "success": True,
@@ -611,11 +866,13 @@ async def server_status() -> Dict[str, Any]:
             "configuration": {
                 "pendle_api": PENDLE_API_URL,
                 "chain_id": PENDLE_CHAIN_ID,
-                "api_timeout": f"{API_TIMEOUT}s"
+                "api_timeout": f"{API_TIMEOUT}s",
+                "markets_cache_ttl": f"{MARKETS_CACHE_TTL:g}s"
             },
             "connectivity": {
-                "pendle_api": api_status,
-                "ethereum_rpc": rpc_status
+                "pendle_api": _API_STATUS,
+                "ethereum_rpc": _RPC_STATUS,
+                "checked_seconds_ago": round(time.monotonic() - _LAST_CHECK, 1)
             },
             "wallet": {
                 "configured": wallet_valid,
@@ -631,7 +888,7 @@ async def server_status() -> Dict[str, Any]:
         }
         
     except Exception as e:
-        logger.error(f"[server_status] Error: {e}")
+        logger.error("[server_status] Error: %s", e)
         return {
             "success": False,
             "status": "error",
@@ -646,8 +903,8 @@ if __name__ == "__main__":
     logger.info("=" * 60)
     logger.info("Starting Pendle Finance MCP Server")
     logger.info("=" * 60)
-    logger.info(f"User Address: {user_address}")
-    logger.info(f"Wallet Valid: {wallet_valid}")
+    # The key itself is derived on first use (see _get_account)
+    logger.info("Wallet: %s", "configured" if PRIVATE_KEY else "not configured")
     logger.info(f"Pendle API: {PENDLE_API_URL}")
     logger.info("=" * 60)
     logger.info("Server ready. Use MCP Inspector to test tools:")
@@ -84,9 +84,89 @@ VALIDATION SCRIPT
 
 import sys
 import os
+import asyncio
+import argparse
+import functools
+from importlib.util import find_spec
 from pathlib import Path
 
-def validate_environment():
+from json_utils import json_loads
+
+
+async def check_connectivity(rpc_url=None):
+    """Probe the Pendle API and, if configured, the Ethereum RPC concurrently"""
+    import httpx
+    from pendle_api import PENDLE_MARKETS_URL
+    
+    limits = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+    async with httpx.AsyncClient(http2=True, limits=limits, timeout=10) as client:
+        probes = [client.get(PENDLE_MARKETS_URL, params={"limit": 1})]
+        if rpc_url:
+            probes.append(client.post(
+                rpc_url,
+                json={"jsonrpc": "2.0", "id": 1, "method": "eth_chainId", "params": []}
+            ))
+        return await asyncio.gather(*probes, return_exceptions=True)
+
+
+def check_network(rpc_url=None):
+    """Test Pendle API (and RPC) connectivity in one round trip"""
+    print("\nTesting network connectivity...")
+    pendle_response, *rpc_responses = asyncio.run(check_connectivity(rpc_url))
+    
+    try:
+        if isinstance(pendle_response, Exception):
+            raise pendle_response
+        if pendle_response.status_code == 200:
+            data = json_loads(pendle_response.content)
+            total = data.get('total', 0)
+            print(f"  [OK] Pendle API connected ({total} markets available)")
+        else:
+            print(f"  [X] Pendle API returned HTTP {pendle_response.status_code}")
+            return False
+    except Exception as e:
+        print(f"  [X] Pendle API connection failed: {e}")
+        return False
+    
+    for rpc_response in rpc_responses:
+        if isinstance(rpc_response, Exception):
+            print(f"  [!] RPC connection failed: {rpc_response} (optional)")
+        elif rpc_response.status_code != 200:
+            print(f"  [!] RPC returned HTTP {rpc_response.status_code} (optional)")
+        else:
+            print("  [OK] RPC connected")
+    
+    return True
+
+
+def check_server_import():
+    """Test that server.py imports cleanly"""
+    print("\nTesting server import...")
+    try:
+        import server
+        print("  [OK] server.py imports successfully")
+    except Exception as e:
+        print(f"  [X] server.py import failed: {e}")
+        return False
+    
+    return True
+
+
+@functools.cache
+def env_file_exists():
+    """Whether a .env file sits next to this script"""
+    return (Path(__file__).parent / ".env").exists()
+
+
+@functools.cache
+def find_missing_packages(packages):
+    """Return the packages that cannot be found, without importing any of them"""
+    # find_spec only locates each package; importing web3 & co. just to
+    # check availability costs over a second
+    return tuple(package for package in packages if find_spec(package) is None)
+
+
+def validate_environment(skip_network=False, skip_import=False, force=False):
     """Validate environment configuration"""
     print("\n" + "="*70)
     print("PENDLE MCP SERVER - ENVIRONMENT VALIDATION")
@@ -95,9 +175,13 @@ def validate_environment():
     # Check Python version
     print("[OK] Python Version:", sys.version.split()[0])
     
+    # Repeated runs in one process reuse the file and dependency checks
+    if force:
+        env_file_exists.cache_clear()
+        find_missing_packages.cache_clear()
+    
     # Check .env file
-    env_path = Path(__file__).parent / ".env"
-    if env_path.exists():
+    if env_file_exists():
         print("[OK] .env file found")
     else:
         print("[!] .env file not found (optional)")
@@ -120,57 +204,34 @@ def validate_environment():
         'fastmcp',
         'dotenv',
         'requests',
+        'httpx',
         'pydantic',
         'web3',
         'eth_account'
     ]
     
-    missing = []
+    missing = find_missing_packages(tuple(required_packages))
     for package in required_packages:
-        try:
-            if package == 'dotenv':
-                __import__('dotenv')
-            elif package == 'eth_account':
-                __import__('eth_account')
-            else:
-                __import__(package)
+        if package not in missing:
             print(f"  [OK] {package}")
-        except ImportError:
+        else:
             print(f"  [X] {package} - MISSING")
-            missing.append(package)
     
     if missing:
         print(f"\n[X] Missing packages: {', '.join(missing)}")
         print("  Run: pip install -r requirements.txt")
         return False
     
-    # Test Pendle API connectivity
-    print("\nTesting Pendle API connectivity...")
-    try:
-        import requests
-        response = requests.get(
-            "https://api-v2.pendle.finance/core/v1/1/markets",
-            params={"limit": 1},
-            timeout=10
-        )
-        if response.status_code == 200:
-            data = response.json()
-            total = data.get('total', 0)
-            print(f"  [OK] Pendle API connected ({total} markets available)")
-        else:
-            print(f"  [X] Pendle API returned HTTP {response.status_code}")
-            return False
-    except Exception as e:
-        print(f"  [X] Pendle API connection failed: {e}")
+    # Test Pendle API (and RPC) connectivity
+    if skip_network:
+        print("\n[!] Skipping network checks (--skip-network)")
+    elif not check_network(rpc_url if rpc_url != 'Not set' else None):
         return False
     
     # Test server import
-    print("\nTesting server import...")
-    try:
-        import server
-        print("  [OK] server.py imports successfully")
-    except Exception as e:
-        print(f"  [X] server.py import failed: {e}")
+    if skip_import:
+        print("\n[!] Skipping server import (--skip-import)")
+    elif not check_server_import():
         return False
     
     print("\n" + "="*70)
@@ -187,11 +248,30 @@ def validate_environment():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate the Pendle MCP server setup")
+    parser.add_argument(
+        "--skip-network", action="store_true",
+        help="skip the Pendle API / RPC connectivity checks"
+    )
+    parser.add_argument(
+        "--skip-import", action="store_true",
+        help="skip importing server.py"
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="re-run cached file and dependency checks"
+    )
+    args = parser.parse_args()
+    
     print(__doc__)
     
     # Run validation
     try:
-        success = validate_environment()
+        success = validate_environment(
+            skip_network=args.skip_network,
+            skip_import=args.skip_import,
+            force=args.force
+        )
         sys.exit(0 if success else 1)
     except KeyboardInterrupt:
         print("\n\nValidation interrupted by user.")
@@ -5,52 +5,73 @@ This script tests the Pendle server by making direct API calls
 and using the AI models, bypassing the MCP layer.
 """
 
+import io
+import sys
+import asyncio
+import hashlib
+import functools
+import contextlib
+
+import numpy as np
 import requests
+
 from ai_models import predict_best_yield, predict_future_yield
+from pendle_api import PENDLE_MARKETS_URL, fetch_markets, fetch_markets_bulk
+
+_HEX_PREFIX = "0x"
+
 
+def write_lines(lines):
+    """Print a block of lines; when not on a terminal, as one buffered write"""
+    if sys.stdout.isatty():
+        for line in lines:
+            print(line)
+    else:
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
 
-def test_pendle_api():
-    """Test direct connection to Pendle API"""
+
+def test_pendle_api(page=None):
+    """Test direct connection to Pendle API (page: result or error of a prefetch)"""
     print("=" * 70)
     print("TESTING PENDLE API CONNECTION")
     print("=" * 70)
     print()
     
     try:
-        url = "https://api-v2.pendle.finance/core/v1/1/markets"
-        params = {"limit": 5, "order_by": "liquidity:desc"}
+        print(f"Fetching from: {PENDLE_MARKETS_URL}")
+        if isinstance(page, Exception):
+            raise page
+        markets, total = page or fetch_markets(limit=5, order_by="liquidity:desc")
+        
+        print(f"[OK] Successfully connected!")
+        print(f"[OK] Total markets available: {total}")
+        print(f"[OK] Fetched top {len(markets)} markets\n")
+        
+        print("Top 5 Yield Opportunities:")
+        print("-" * 70)
+        # Extract each column in one pass, then format without dict lookups
+        symbols = [m.get('proSymbol', 'Unknown') for m in markets]
+        protocols = [m.get('protocol', 'Unknown') for m in markets]
+        implied_apys = [m.get('impliedApy', 0) * 100 for m in markets]
+        liquidities = [(m.get('liquidity') or {}).get('usd', 0) for m in markets]
+        
+        lines = []
+        for i, (symbol, protocol, implied_apy, liquidity) in enumerate(
+            zip(symbols, protocols, implied_apys, liquidities), 1
+        ):
+            lines.append(f"{i}. {symbol}")
+            lines.append(f"   Protocol: {protocol}")
+            lines.append(f"   Implied APY: {implied_apy:.2f}%")
+            lines.append(f"   Liquidity: ${liquidity:,.0f}")
+            lines.append("")
+        write_lines(lines)
         
-        print(f"Fetching from: {url}")
-        response = requests.get(url, params=params, timeout=10)
+        return markets
         
-        if response.status_code == 200:
-            data = response.json()
-            markets = data.get('results', [])
-            total = data.get('total', 0)
-            
-            print(f"[OK] Successfully connected!")
-            print(f"[OK] Total markets available: {total}")
-            print(f"[OK] Fetched top {len(markets)} markets\n")
-            
-            print("Top 5 Yield Opportunities:")
-            print("-" * 70)
-            for i, market in enumerate(markets, 1):
-                symbol = market.get('proSymbol', 'Unknown')
-                protocol = market.get('protocol', 'Unknown')
-                implied_apy = market.get('impliedApy', 0) * 100
-                liquidity = market.get('liquidity', {}).get('usd', 0)
-                
-                print(f"{i}. {symbol}")
-                print(f"   Protocol: {protocol}")
-                print(f"   Implied APY: {implied_apy:.2f}%")
-                print(f"   Liquidity: ${liquidity:,.0f}")
-                print()
-            
-            return markets
-        else:
-            print(f"[X] API returned status code: {response.status_code}")
-            return []
-            
+    except requests.HTTPError as e:
+        print(f"[X] API returned status code: {e.response.status_code}")
+        return []
     except Exception as e:
         print(f"[X] Error connecting to Pendle API: {e}")
         return []
@@ -92,11 +113,8 @@ def test_ai_predictions(markets_data):
     print("-" * 70)
     try:
         # Get current APY for sUSDe if available
-        current_apy = None
-        for market in markets_data:
-            if 'sUSDe' in market.get('proSymbol', ''):
-                current_apy = market.get('impliedApy', 0)
-                break
+        market = fetch_markets_bulk(["sUSDe"], markets=markets_data).get("sUSDe")
+        current_apy = market.get('impliedApy', 0) if market else None
         
         predictions = predict_future_yield("sUSDe", 7, current_apy)
         print(f"[OK] Generated {len(predictions)} daily predictions")
@@ -111,6 +129,12 @@ def test_ai_predictions(markets_data):
         print(f"[X] Future prediction failed: {e}\n")
 
 
+def mock_tx_hash(kind, user_address, token, amount):
+    """Deterministic 32-byte mock transaction hash (stable across runs, unlike hash())"""
+    payload = f"{kind}|{user_address}|{token}|{amount}".encode()
+    return _HEX_PREFIX + hashlib.blake2b(payload, digest_size=32).digest().hex()
+
+
 def test_transaction_simulation():
     """Test transaction simulation logic"""
     print("=" * 70)
@@ -125,7 +149,7 @@ def test_transaction_simulation():
     token = "PENDLE"
     amount = 100.0
     
-    tx_hash = f"0x{hash(f'{user_address}{token}{amount}') % (10**64):064x}"
+    tx_hash = mock_tx_hash("stake", user_address, token, amount)
     print(f"[OK] Simulated staking {amount} {token}")
     print(f"  User: {user_address}")
     print(f"  TX Hash: {tx_hash}")
@@ -137,7 +161,7 @@ def test_transaction_simulation():
     token = "sUSDe"
     amount = 50.0
     
-    tx_hash = f"0x{hash(f'{token}{amount}{user_address}') % (10**64):064x}"
+    tx_hash = mock_tx_hash("swap", user_address, token, amount)
     print(f"[OK] Simulated swapping {amount} {token}")
     print(f"  User: {user_address}")
     print(f"  TX Hash: {tx_hash}")
@@ -160,16 +184,54 @@ def test_portfolio():
         {"token": "PENDLE", "amount": 200.00, "value_usd": 1240.00, "apy": "N/A"}
     ]
     
-    total_value = sum(h['value_usd'] for h in holdings)
+    # Numeric aggregates run on a column array; the dicts are kept for display
+    value_usd = np.fromiter(
+        (h['value_usd'] for h in holdings), dtype=np.float64, count=len(holdings)
+    )
+    total_value = value_usd.sum()
     
     print(f"Portfolio for: {address}")
     print("-" * 70)
     print(f"Total Value: ${total_value:,.2f}\n")
     print("Holdings:")
+    lines = []
     for holding in holdings:
-        print(f"  - {holding['amount']} {holding['token']}")
-        print(f"    Value: ${holding['value_usd']:,.2f} | APY: {holding['apy']}")
-    print()
+        lines.append(f"  - {holding['amount']} {holding['token']}")
+        lines.append(f"    Value: ${holding['value_usd']:,.2f} | APY: {holding['apy']}")
+    lines.append("")
+    write_lines(lines)
+
+
+async def run_tests():
+    """Run the test phases, overlapping the market fetch with the offline ones"""
+    # Submit the only network call to a worker thread right away (a task
+    # wrapping to_thread would not start until the loop next gets control)
+    loop = asyncio.get_running_loop()
+    page_future = loop.run_in_executor(
+        None, functools.partial(fetch_markets, limit=5, order_by="liquidity:desc")
+    )
+    
+    # Tests 3-4 don't need market data: run them while the fetch is in
+    # flight and hold their output so the report keeps its usual order
+    offline_output = io.StringIO()
+    with contextlib.redirect_stdout(offline_output):
+        test_transaction_simulation()
+        test_portfolio()
+    
+    try:
+        page = await page_future
+    except Exception as e:
+        page = e
+    
+    # Test 1: Pendle API
+    markets = test_pendle_api(page)
+    
+    # Test 2: AI Predictions
+    if markets:
+        test_ai_predictions(markets)
+    
+    # Tests 3-4: Transactions and Portfolio
+    sys.stdout.write(offline_output.getvalue())
 
 
 def main():
@@ -186,18 +248,7 @@ def main():
     print("  [OK] Portfolio tracking")
     print("\n" + "=" * 70 + "\n")
     
-    # Test 1: Pendle API
-    markets = test_pendle_api()
-    
-    # Test 2: AI Predictions
-    if markets:
-        test_ai_predictions(markets)
-    
-    # Test 3: Transactions
-    test_transaction_simulation()
-    
-    # Test 4: Portfolio
-    test_portfolio()
+    asyncio.run(run_tests())
     
     # Summary
     print("=" * 70)